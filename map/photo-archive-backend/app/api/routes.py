@@ -1,21 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query, Request
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse, Response, ORJSONResponse
+from starlette.formparsers import MultiPartParser
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text, func
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import text, func, select
+import asyncio
+import csv
 import logging
 import os
+import shutil
+import time
 import uuid
-from typing import Optional
+from concurrent.futures import Executor
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Annotated, Any, BinaryIO, Iterable, List, Optional, Sequence, Tuple, Union
+from pydantic import Field
 from PIL import Image
 import io
 
 from app.models.database import get_db
-from app.models.photo import Photo
-from app.models.user import User
+from app.models.photo import Photo, new_photo_id
 from app.config import get_settings
+from app.cache import user_exists, forget_user
 from app.api.schemas import (
     PhotoUploadResponse,
+    PhotoBulkUploadResponse,
     PhotoLocationUpdate,
     PhotoDetail,
     PhotoListResponse,
@@ -35,6 +48,31 @@ THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", "./storage/thumbnails")
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".mp4", ".mov", ".avi", ".webm"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB for images
 MAX_VIDEO_SIZE = 100 * 1024 * 1024  # 100MB for videos
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read/write chunks when copying uploads
+# Uploads larger than this are spooled to a temporary file by the multipart parser
+# (renamed spool_max_size in later Starlette releases)
+UPLOAD_SPOOL_MAX_SIZE = getattr(MultiPartParser, "spool_max_size", MultiPartParser.max_file_size)
+
+# Leading bytes of each image format, checked before anything is written or decoded
+IMAGE_SIGNATURES = {
+    ".jpg": b"\xff\xd8\xff",
+    ".jpeg": b"\xff\xd8\xff",
+    ".png": b"\x89PNG\r\n\x1a\n",
+    ".webp": b"RIFF",  # followed by a 4-byte size and b"WEBP"
+}
+SIGNATURE_LENGTH = 12
+
+# SQLSTATE of a foreign key violation (photos.user_id -> users.id)
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Seconds a successful health check is reused before pinging the database again
+HEALTH_CACHE_TTL = 5.0
+
+# Use NVDEC for video thumbnails only when enabled and an Nvidia driver is present
+NVDEC_AVAILABLE = settings.FFMPEG_HWACCEL and shutil.which("nvidia-smi") is not None
+
+# Monotonic time of the last successful database ping
+_last_healthy_at: Optional[float] = None
 
 # Ensure storage directories exist
 os.makedirs(STORAGE_DIR, exist_ok=True)
@@ -47,32 +85,155 @@ def is_video_file(filename: str) -> bool:
     return ext in {".mp4", ".mov", ".avi", ".webm"}
 
 
-def create_thumbnail(image_path: str, thumbnail_path: str, size=(200, 200)):
-    """Create a thumbnail from an image"""
+def is_foreign_key_violation(e: Exception) -> bool:
+    """
+    Check for a foreign key violation, whether raised through the ORM (wrapped
+    in IntegrityError) or directly by psycopg from a raw COPY.
+    """
+    orig = e.orig if isinstance(e, IntegrityError) else e
+    return getattr(orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION
+
+
+async def has_valid_signature(file: UploadFile, file_ext: str) -> bool:
+    """
+    Check an image upload's leading bytes against its declared extension.
+
+    Rejects corrupt or mislabeled images from a 12-byte read instead of a full
+    PIL decode. Videos aren't checked here; ffmpeg fails on them cheaply.
+    """
+    signature = IMAGE_SIGNATURES.get(file_ext)
+    if signature is None:
+        return True
+
+    header = await file.read(SIGNATURE_LENGTH)
+    await file.seek(0)
+
+    if not header.startswith(signature):
+        return False
+    if file_ext == ".webp":
+        return header[8:12] == b"WEBP"
+    return True
+
+
+def file_response(
+    path: str,
+    media_type: str,
+    location: str,
+    headers: Optional[dict] = None
+) -> Response:
+    """
+    Serve a stored file.
+
+    Behind nginx (X_ACCEL_REDIRECT_PREFIX set) the body is handed off via
+    X-Accel-Redirect so nginx sends it with sendfile(2); otherwise Starlette
+    streams it directly. Extra headers are added to either response.
+    """
+    if settings.X_ACCEL_REDIRECT_PREFIX:
+        redirect = f"{settings.X_ACCEL_REDIRECT_PREFIX}/{location}/{os.path.basename(path)}"
+        return Response(
+            media_type=media_type,
+            headers={**(headers or {}), "X-Accel-Redirect": redirect}
+        )
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+def accepts_webp(accept: str) -> bool:
+    """
+    Check whether an Accept header allows image/webp.
+
+    The most specific matching media range decides (image/webp, then image/*,
+    then */*), and a range with q=0 means "not acceptable".
+    """
+    quality = {}
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    pass
+        media_type = media_type.strip().lower()
+        quality[media_type] = max(quality.get(media_type, 0.0), q)
+
+    for media_type in ("image/webp", "image/*", "*/*"):
+        if media_type in quality:
+            return quality[media_type] > 0
+    return False
+
+
+def thumbnail_filename_for(photo_id: uuid.UUID, filename: str) -> str:
+    """Thumbnail file name: WebP for images, JPEG for video frames extracted by ffmpeg"""
+    return f"{photo_id}_thumb.jpg" if is_video_file(filename) else f"{photo_id}_thumb.webp"
+
+
+def create_thumbnail(image_source: Union[str, BinaryIO], thumbnail_path: str, size=(200, 200)):
+    """Create a WebP thumbnail from an image (file path or in-memory file object)"""
     try:
-        with Image.open(image_path) as img:
+        with Image.open(image_source) as img:
+            # Let libjpeg-turbo downscale during decode (JPEG only, no-op otherwise);
+            # keep 2x headroom so LANCZOS still does the final refine
+            img.draft("RGB", (size[0] * 2, size[1] * 2))
+
             # Convert to RGB if necessary
             if img.mode in ('RGBA', 'LA', 'P'):
                 img = img.convert('RGB')
 
             # Create thumbnail
             img.thumbnail(size, Image.Resampling.LANCZOS)
-            img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
+            img.save(thumbnail_path, "WEBP", quality=80, method=4)
             return True
     except Exception as e:
         logger.error(f"Failed to create thumbnail: {e}")
         return False
 
 
+def transcode_thumbnail_to_jpeg(thumbnail_path: str) -> bytes:
+    """Re-encode a stored WebP thumbnail as JPEG (runs in a worker thread)"""
+    buffer = io.BytesIO()
+    with Image.open(thumbnail_path) as img:
+        img.convert("RGB").save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
 def create_video_thumbnail(video_path: str, thumbnail_path: str, time_offset: str = "00:00:01"):
-    """Create a thumbnail from a video using ffmpeg"""
+    """Create a thumbnail from a video using ffmpeg (NVDEC-accelerated when enabled)"""
     import subprocess
     try:
+        if NVDEC_AVAILABLE:
+            # Decode and scale on the GPU, then download the single frame for JPEG encoding
+            hw_cmd = [
+                'ffmpeg',
+                '-hide_banner', '-loglevel', 'error',
+                '-hwaccel', 'cuda',
+                '-hwaccel_output_format', 'cuda',
+                '-ss', time_offset,  # Input seek: jump to the nearest keyframe
+                '-i', video_path,
+                '-an', '-sn', '-dn',  # Skip audio/subtitle/data streams
+                '-vframes', '1',
+                '-vf',
+                'scale_cuda=200:200:force_original_aspect_ratio=decrease,hwdownload,format=nv12',
+                '-y',  # Overwrite output file
+                thumbnail_path
+            ]
+            result = subprocess.run(hw_cmd, capture_output=True, text=True, timeout=10)
+            if result.returncode == 0 and os.path.exists(thumbnail_path):
+                return True
+            # Hardware decode can fail for unsupported codecs/drivers; retry on the CPU
+            logger.warning(
+                f"ffmpeg hwaccel failed, falling back to software decode: {result.stderr}"
+            )
+
         # Use ffmpeg to extract a frame from the video
         cmd = [
             'ffmpeg',
-            '-i', video_path,
+            '-hide_banner', '-loglevel', 'error',
+            # Input seek: jump to the nearest keyframe instead of decoding up to it
             '-ss', time_offset,
+            '-i', video_path,
+            '-an', '-sn', '-dn',  # Skip audio/subtitle/data streams
             '-vframes', '1',
             '-vf', 'scale=200:200:force_original_aspect_ratio=decrease',
             '-y',  # Overwrite output file
@@ -96,16 +257,170 @@ def create_video_thumbnail(video_path: str, thumbnail_path: str, time_offset: st
         return False
 
 
+def copy_upload_to_storage(
+    src: BinaryIO,
+    storage_path: str,
+    max_size: int,
+    keep_contents: bool,
+    on_disk: bool = False
+) -> Tuple[int, Optional[bytes]]:
+    """
+    Copy a spooled upload to storage (runs in a worker thread).
+
+    The whole copy happens in one thread hop instead of one per chunk. When the
+    upload has been spooled to disk and its contents aren't needed in memory,
+    the data is copied file-to-file inside the kernel with copy_file_range(2).
+    on_disk must only be set for uploads spooled to a temporary file, since
+    fileno() would roll an in-memory spool over to disk. Stops as soon as
+    max_size is exceeded; returns the bytes seen and, if keep_contents, the
+    file contents.
+    """
+    src.seek(0)
+
+    if on_disk and not keep_contents and hasattr(os, "copy_file_range"):
+        file_size = os.fstat(src.fileno()).st_size
+        if file_size > max_size:
+            return file_size, None
+        with open(storage_path, "wb") as dst:
+            copied = 0
+            try:
+                while copied < file_size:
+                    count = os.copy_file_range(src.fileno(), dst.fileno(), file_size - copied)
+                    if count == 0:
+                        break
+                    copied += count
+            except OSError:
+                copied = -1
+            if copied != file_size:
+                # Unsupported for this filesystem/kernel (an error, or 0 bytes copied);
+                # fall back to a userspace copy
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+                shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+        return file_size, None
+
+    file_size = 0
+    chunks = [] if keep_contents else None
+    with open(storage_path, "wb") as dst:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            if file_size > max_size:
+                break
+            dst.write(chunk)
+            if chunks is not None:
+                chunks.append(chunk)
+
+    return file_size, b"".join(chunks) if chunks is not None else None
+
+
+def encode_copy_rows(rows: Iterable[Sequence[Any]]) -> str:
+    """
+    Encode rows for COPY ... FROM STDIN WITH (FORMAT csv).
+
+    None is written as an unquoted empty field, which COPY reads as NULL;
+    fields containing commas, quotes or newlines are quoted and escaped.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def remove_files(*paths: Optional[str]) -> None:
+    """Unlink stored files, ignoring ones that are already gone (runs after the response)"""
+    for path in paths:
+        if not path:
+            continue
+        try:
+            Path(path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {e}")
+
+
+async def save_upload_file(file: UploadFile, storage_path: str) -> Tuple[int, Optional[bytes]]:
+    """
+    Write an uploaded file to storage.
+
+    Rejects files over the size limit for their type, removing any partial
+    file. Returns the number of bytes written and, for images (capped at
+    MAX_FILE_SIZE), the file contents so the thumbnail can be decoded without
+    reading the file back from disk; contents is None for videos.
+    """
+    is_video = is_video_file(file.filename)
+    max_size = MAX_VIDEO_SIZE if is_video else MAX_FILE_SIZE
+    max_size_mb = max_size / (1024*1024)
+    kind = "videos" if is_video else "images"
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size for {kind}: {max_size_mb:.0f}MB"
+    )
+
+    # The multipart parser already knows the size; reject before touching storage
+    if file.size is not None and file.size > max_size:
+        raise too_large
+
+    # The parser rolls an upload over to a temporary file once it passes the spool limit
+    on_disk = file.size is not None and file.size > UPLOAD_SPOOL_MAX_SIZE
+    file_size, contents = await run_in_threadpool(
+        copy_upload_to_storage, file.file, storage_path, max_size, not is_video, on_disk
+    )
+
+    if file_size > max_size:
+        if os.path.exists(storage_path):
+            os.remove(storage_path)
+        raise too_large
+
+    return file_size, contents
+
+
+async def create_upload_thumbnail(
+    pool: Executor,
+    filename: str,
+    storage_path: str,
+    thumbnail_path: str,
+    contents: Optional[bytes] = None
+) -> bool:
+    """
+    Create a thumbnail for a stored upload (different logic for images vs videos).
+
+    Image decoding/resizing is CPU-bound, so it runs in ``pool`` (the app's
+    process pool) to use all cores and keep the event loop free. Images are
+    decoded from ``contents`` when given, otherwise from storage_path.
+    """
+    loop = asyncio.get_running_loop()
+    if is_video_file(filename):
+        # ffmpeg already runs in its own process; just keep the wait off the event loop
+        return await loop.run_in_executor(
+            None, create_video_thumbnail, storage_path, thumbnail_path
+        )
+    source = io.BytesIO(contents) if contents is not None else storage_path
+    return await loop.run_in_executor(pool, create_thumbnail, source, thumbnail_path)
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check(db: Session = Depends(get_db)):
-    """Health check endpoint"""
-    try:
-        # Test database connection
-        db.execute(text("SELECT 1"))
+    """
+    Health check endpoint.
+
+    A successful database ping is reused for HEALTH_CACHE_TTL seconds so
+    frequent liveness/readiness probes don't each check out a connection;
+    failures are never cached.
+    """
+    global _last_healthy_at
+
+    now = time.monotonic()
+    if _last_healthy_at is not None and now - _last_healthy_at < HEALTH_CACHE_TTL:
         db_status = "connected"
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        db_status = "disconnected"
+    else:
+        try:
+            # Test database connection
+            db.execute(text("SELECT 1"))
+            db_status = "connected"
+            _last_healthy_at = now
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            db_status = "disconnected"
+            _last_healthy_at = None
 
     return HealthResponse(
         status="healthy" if db_status == "connected" else "unhealthy",
@@ -114,12 +429,13 @@ async def health_check(db: Session = Depends(get_db)):
     )
 
 
-@router.post("/photos/upload", response_model=PhotoUploadResponse)
+@router.post("/photos/upload", responses={200: {"model": PhotoUploadResponse}})
 async def upload_photo(
+    request: Request,
     file: UploadFile = File(...),
-    user_id: str = Form(...),
-    latitude: float = Form(...),
-    longitude: float = Form(...),
+    user_id: uuid.UUID = Form(...),
+    latitude: float = Form(..., ge=-90, le=90),
+    longitude: float = Form(..., ge=-180, le=180),
     db: Session = Depends(get_db)
 ):
     """
@@ -130,56 +446,35 @@ async def upload_photo(
     - **latitude**: Geographic latitude (-90 to 90)
     - **longitude**: Geographic longitude (-180 to 180)
     """
-    # Validate user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # Validate user exists (cached; the foreign key catches users deleted meanwhile)
+    if not await user_exists(user_id, db):
         raise HTTPException(status_code=404, detail=f"User not found: {user_id}")
-    # Validate file extension
+    # Validate file extension (coordinate ranges are enforced by the Form validators)
     file_ext = os.path.splitext(file.filename)[1].lower()
     if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
-
-    # Validate coordinates
-    if not (-90 <= latitude <= 90):
-        raise HTTPException(status_code=400, detail=f"Invalid latitude: {latitude}")
-    if not (-180 <= longitude <= 180):
-        raise HTTPException(status_code=400, detail=f"Invalid longitude: {longitude}")
+    if not await has_valid_signature(file, file_ext):
+        raise HTTPException(
+            status_code=400,
+            detail=f"File content does not match its {file_ext} extension"
+        )
 
     try:
         # Generate unique ID and file paths
-        photo_id = str(uuid.uuid4())
+        photo_id = new_photo_id()
         storage_filename = f"{photo_id}{file_ext}"
         storage_path = os.path.join(STORAGE_DIR, storage_filename)
-        thumbnail_filename = f"{photo_id}_thumb.jpg"
+        thumbnail_filename = thumbnail_filename_for(photo_id, file.filename)
         thumbnail_path = os.path.join(THUMBNAIL_DIR, thumbnail_filename)
 
-        # Read and validate file size
-        contents = await file.read()
-        file_size = len(contents)
-
-        # Check file size based on type (video vs image)
-        is_video = is_video_file(file.filename)
-        max_size = MAX_VIDEO_SIZE if is_video else MAX_FILE_SIZE
-        max_size_mb = max_size / (1024*1024)
-
-        if file_size > max_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size for {'videos' if is_video else 'images'}: {max_size_mb:.0f}MB"
-            )
-
-        # Save file
-        with open(storage_path, "wb") as f:
-            f.write(contents)
-
-        # Create thumbnail (different logic for images vs videos)
-        if is_video:
-            thumbnail_created = create_video_thumbnail(storage_path, thumbnail_path)
-        else:
-            thumbnail_created = create_thumbnail(storage_path, thumbnail_path)
+        # Stream file to disk and create its thumbnail
+        file_size, contents = await save_upload_file(file, storage_path)
+        thumbnail_created = await create_upload_thumbnail(
+            request.app.state.thumbnail_pool, file.filename, storage_path, thumbnail_path, contents
+        )
 
         # Create database record
         photo = Photo(
@@ -200,28 +495,152 @@ async def upload_photo(
 
         logger.info(f"Photo uploaded: {photo_id} at ({latitude}, {longitude})")
 
-        return PhotoUploadResponse(
-            id=photo.id,
+        return ORJSONResponse(PhotoUploadResponse(
+            id=str(photo.id),
             filename=photo.filename,
             location={"latitude": latitude, "longitude": longitude},
             upload_date=photo.upload_date.isoformat(),
-            thumbnail_url=f"/api/v1/photos/{photo.id}/thumbnail" if thumbnail_created else None,
-            image_url=f"/api/v1/photos/{photo.id}/image"
-        )
+            thumbnail_url=Photo.THUMBNAIL_URL_FORMAT % photo.id if thumbnail_created else None,
+            image_url=Photo.IMAGE_URL_FORMAT % photo.id
+        ).model_dump())
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Photo upload failed: {e}")
+        db.rollback()
         # Cleanup files if database operation failed
         if os.path.exists(storage_path):
             os.remove(storage_path)
         if os.path.exists(thumbnail_path):
             os.remove(thumbnail_path)
+        if is_foreign_key_violation(e):
+            # User was deleted while still cached as existing
+            await forget_user(user_id)
+            raise HTTPException(status_code=404, detail=f"User not found: {user_id}")
+        logger.error(f"Photo upload failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to upload photo")
 
 
-@router.get("/photos", response_model=PhotoListResponse)
+@router.post("/photos/bulk_upload", responses={200: {"model": PhotoBulkUploadResponse}})
+async def bulk_upload_photos(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    user_id: uuid.UUID = Form(...),
+    latitudes: List[Annotated[float, Field(ge=-90, le=90)]] = Form(...),
+    longitudes: List[Annotated[float, Field(ge=-180, le=180)]] = Form(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a batch of photos (e.g. a camera roll sync) in a single transaction.
+
+    - **files**: Image/video files
+    - **user_id**: ID of the user uploading the photos
+    - **latitudes**: Geographic latitude per file, in the same order as files
+    - **longitudes**: Geographic longitude per file, in the same order as files
+
+    Metadata rows are written with one PostgreSQL COPY instead of per-photo
+    INSERT/commit/refresh round-trips.
+    """
+    # Validate user exists (cached; the foreign key catches users deleted meanwhile)
+    if not await user_exists(user_id, db):
+        raise HTTPException(status_code=404, detail=f"User not found: {user_id}")
+
+    if not (len(files) == len(latitudes) == len(longitudes)):
+        raise HTTPException(
+            status_code=400,
+            detail="files, latitudes and longitudes must have the same length"
+        )
+
+    # Validate every file before writing anything
+    for file in files:
+        file_ext = os.path.splitext(file.filename)[1].lower()
+        if file_ext not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Invalid file type for {file.filename}. "
+                    f"Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+                )
+            )
+        if not await has_valid_signature(file, file_ext):
+            raise HTTPException(
+                status_code=400,
+                detail=f"File content of {file.filename} does not match its {file_ext} extension"
+            )
+
+    written_paths = []
+    try:
+        upload_date = datetime.now(timezone.utc)
+        rows = []
+        uploaded = []
+
+        for file, latitude, longitude in zip(files, latitudes, longitudes):
+            # IDs are generated client-side so no refresh is needed after COPY
+            photo_id = new_photo_id()
+            file_ext = os.path.splitext(file.filename)[1].lower()
+            storage_path = os.path.join(STORAGE_DIR, f"{photo_id}{file_ext}")
+            thumbnail_path = os.path.join(
+                THUMBNAIL_DIR, thumbnail_filename_for(photo_id, file.filename)
+            )
+
+            file_size, contents = await save_upload_file(file, storage_path)
+            written_paths.append(storage_path)
+            thumbnail_created = await create_upload_thumbnail(
+                request.app.state.thumbnail_pool, file.filename,
+                storage_path, thumbnail_path, contents
+            )
+            if thumbnail_created:
+                written_paths.append(thumbnail_path)
+
+            rows.append([
+                photo_id, user_id, file.filename, storage_path,
+                thumbnail_path if thumbnail_created else None,
+                latitude, longitude, file_size,
+                file.content_type or "image/jpeg", upload_date.isoformat()
+            ])
+
+            uploaded.append(PhotoUploadResponse(
+                id=str(photo_id),
+                filename=file.filename,
+                location={"latitude": latitude, "longitude": longitude},
+                upload_date=upload_date.isoformat(),
+                thumbnail_url=Photo.THUMBNAIL_URL_FORMAT % photo_id if thumbnail_created else None,
+                image_url=Photo.IMAGE_URL_FORMAT % photo_id
+            ))
+
+        # Insert all metadata rows with a single COPY on the session's connection
+        with db.connection().connection.cursor() as cursor:
+            with cursor.copy(
+                "COPY photos (id, user_id, filename, storage_path, thumbnail_path, "
+                "latitude, longitude, file_size, mime_type, upload_date) "
+                "FROM STDIN WITH (FORMAT csv)"
+            ) as copy:
+                copy.write(encode_copy_rows(rows))
+        db.commit()
+
+        logger.info(f"Bulk uploaded {len(uploaded)} photos for user {user_id}")
+
+        return ORJSONResponse(
+            PhotoBulkUploadResponse(photos=uploaded, total=len(uploaded)).model_dump()
+        )
+
+    except Exception as e:
+        db.rollback()
+        # Cleanup every file written for this batch
+        for path in written_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        if isinstance(e, HTTPException):
+            raise
+        if is_foreign_key_violation(e):
+            # User was deleted while still cached as existing
+            await forget_user(user_id)
+            raise HTTPException(status_code=404, detail=f"User not found: {user_id}")
+        logger.error(f"Bulk photo upload failed: {e}")
+        raise HTTPException(status_code=500, detail="Failed to upload photos")
+
+
+@router.get("/photos", responses={200: {"model": PhotoListResponse}})
 async def get_photos(
     limit: int = 100,
     offset: int = 0,
@@ -234,41 +653,88 @@ async def get_photos(
     - **offset**: Number of photos to skip (default: 0)
     """
     try:
-        # Get total count
-        total = db.query(func.count(Photo.id)).scalar()
-
-        # Get photos
-        photos = db.query(Photo).order_by(Photo.upload_date.desc()).limit(limit).offset(offset).all()
+        # Get photos as plain rows (no ORM instances, no response_model revalidation),
+        # with the total count computed in the same statement via a window function
+        rows = db.execute(
+            select(*Photo.LIST_COLUMNS, func.count().over().label("total"))
+            .order_by(Photo.upload_date.desc())
+            .limit(limit)
+            .offset(offset)
+        ).all()
+
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page there is no row to carry the window count
+            total = db.query(func.count(Photo.id)).scalar() if offset else 0
 
-        photo_list = [photo.to_dict() for photo in photos]
-
-        return PhotoListResponse(
-            photos=photo_list,
-            total=total,
-            limit=limit,
-            offset=offset
-        )
+        return ORJSONResponse({
+            "photos": [Photo.row_to_dict(row) for row in rows],
+            "total": total,
+            "limit": limit,
+            "offset": offset
+        })
 
     except Exception as e:
         logger.error(f"Failed to fetch photos: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch photos")
 
 
-@router.get("/photos/{photo_id}", response_model=PhotoDetail)
-async def get_photo(photo_id: str, db: Session = Depends(get_db)):
+@router.get("/photos/nearest", responses={200: {"model": PhotoListResponse}})
+async def get_nearest_photos(
+    latitude: float = Query(..., ge=-90, le=90, description="Latitude of the reference point"),
+    longitude: float = Query(..., ge=-180, le=180, description="Longitude of the reference point"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of photos to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the photos closest to a point, nearest first.
+
+    - **latitude**: Geographic latitude (-90 to 90)
+    - **longitude**: Geographic longitude (-180 to 180)
+    - **limit**: Maximum number of photos to return (1-100, default: 10)
+
+    Uses a KNN ``ORDER BY location <-> point`` so PostgreSQL walks the GIST
+    index on photos.location instead of scanning and sorting every row.
+    """
+    try:
+        point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+        rows = db.execute(
+            select(*Photo.LIST_COLUMNS)
+            .order_by(Photo.location.distance_centroid(point))
+            .limit(limit)
+        ).all()
+
+        return ORJSONResponse({
+            "photos": [Photo.row_to_dict(row) for row in rows],
+            "total": len(rows),
+            "limit": limit,
+            "offset": 0
+        })
+
+    except Exception as e:
+        logger.error(f"Failed to fetch nearest photos: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch nearest photos")
+
+
+@router.get("/photos/{photo_id}", responses={200: {"model": PhotoDetail}})
+async def get_photo(photo_id: uuid.UUID, db: Session = Depends(get_db)):
     """Get photo details by ID"""
     photo = db.query(Photo).filter(Photo.id == photo_id).first()
 
     if not photo:
         raise HTTPException(status_code=404, detail="Photo not found")
 
-    return photo.to_dict()
+    return Response(content=photo.to_bytes(), media_type="application/json")
 
 
 @router.get("/photos/{photo_id}/image")
-async def get_photo_image(photo_id: str, db: Session = Depends(get_db)):
+async def get_photo_image(photo_id: uuid.UUID, db: Session = Depends(get_db)):
     """Get full-size photo image"""
-    photo = db.query(Photo).filter(Photo.id == photo_id).first()
+    # Only the file columns, as a plain row (no ORM instance per image request)
+    photo = db.execute(
+        select(Photo.storage_path, Photo.mime_type).where(Photo.id == photo_id)
+    ).first()
 
     if not photo:
         raise HTTPException(status_code=404, detail="Photo not found")
@@ -276,13 +742,14 @@ async def get_photo_image(photo_id: str, db: Session = Depends(get_db)):
     if not os.path.exists(photo.storage_path):
         raise HTTPException(status_code=404, detail="Image file not found")
 
-    return FileResponse(photo.storage_path, media_type=photo.mime_type)
+    return file_response(photo.storage_path, photo.mime_type, "photos")
 
 
 @router.get("/photos/{photo_id}/thumbnail")
-async def get_photo_thumbnail(photo_id: str, db: Session = Depends(get_db)):
-    """Get photo thumbnail"""
-    photo = db.query(Photo).filter(Photo.id == photo_id).first()
+async def get_photo_thumbnail(photo_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+    """Get photo thumbnail (WebP, or JPEG for clients that don't accept WebP)"""
+    # Only the file column, as a plain row (galleries request one thumbnail per photo)
+    photo = db.execute(select(Photo.thumbnail_path).where(Photo.id == photo_id)).first()
 
     if not photo:
         raise HTTPException(status_code=404, detail="Photo not found")
@@ -290,12 +757,23 @@ async def get_photo_thumbnail(photo_id: str, db: Session = Depends(get_db)):
     if not photo.thumbnail_path or not os.path.exists(photo.thumbnail_path):
         raise HTTPException(status_code=404, detail="Thumbnail not found")
 
-    return FileResponse(photo.thumbnail_path, media_type="image/jpeg")
+    if not photo.thumbnail_path.endswith(".webp"):
+        # Video frames and thumbnails created before the switch to WebP
+        return file_response(photo.thumbnail_path, "image/jpeg", "thumbnails")
+
+    if not accepts_webp(request.headers.get("accept", "*/*")):
+        # Rare legacy client: transcode on the fly rather than storing both formats
+        content = await run_in_threadpool(transcode_thumbnail_to_jpeg, photo.thumbnail_path)
+        return Response(content=content, media_type="image/jpeg", headers={"Vary": "Accept"})
+
+    return file_response(
+        photo.thumbnail_path, "image/webp", "thumbnails", headers={"Vary": "Accept"}
+    )
 
 
-@router.patch("/photos/{photo_id}/location", response_model=PhotoDetail)
+@router.patch("/photos/{photo_id}/location", responses={200: {"model": PhotoDetail}})
 async def update_photo_location(
-    photo_id: str,
+    photo_id: uuid.UUID,
     location: PhotoLocationUpdate,
     db: Session = Depends(get_db)
 ):
@@ -314,7 +792,7 @@ async def update_photo_location(
 
         logger.info(f"Photo location updated: {photo_id} to ({location.latitude}, {location.longitude})")
 
-        return photo.to_dict()
+        return Response(content=photo.to_bytes(), media_type="application/json")
 
     except Exception as e:
         logger.error(f"Failed to update photo location: {e}")
@@ -323,23 +801,24 @@ async def update_photo_location(
 
 
 @router.delete("/photos/{photo_id}", response_model=PhotoDeleteResponse)
-async def delete_photo(photo_id: str, db: Session = Depends(get_db)):
-    """Delete a photo"""
+async def delete_photo(
+    photo_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Delete a photo (its files are removed after the response is sent)"""
     photo = db.query(Photo).filter(Photo.id == photo_id).first()
 
     if not photo:
         raise HTTPException(status_code=404, detail="Photo not found")
 
     try:
-        # Delete files
-        if os.path.exists(photo.storage_path):
-            os.remove(photo.storage_path)
-        if photo.thumbnail_path and os.path.exists(photo.thumbnail_path):
-            os.remove(photo.thumbnail_path)
+        storage_path, thumbnail_path = photo.storage_path, photo.thumbnail_path
 
-        # Delete database record
+        # Delete database record, then the files once the response is out
         db.delete(photo)
         db.commit()
+        background_tasks.add_task(remove_files, storage_path, thumbnail_path)
 
         logger.info(f"Photo deleted: {photo_id}")
 
@@ -1,8 +1,12 @@
-from pydantic import BaseModel, Field, field_validator, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, field_validator, EmailStr
 from typing import List, Optional, Dict
 from datetime import datetime
 
 
+# Shared by the response models so they can be populated straight from ORM objects
+RESPONSE_MODEL_CONFIG = ConfigDict(from_attributes=True)
+
+
 # ============================================================
 # User Schemas
 # ============================================================
@@ -22,6 +26,8 @@ class UserUpdate(BaseModel):
 
 class UserMinimal(BaseModel):
     """Minimal user information for embedding"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     username: str
     display_name: str
@@ -29,6 +35,8 @@ class UserMinimal(BaseModel):
 
 class UserDetail(BaseModel):
     """Detailed user information"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     username: str
     display_name: str
@@ -42,6 +50,8 @@ class UserDetail(BaseModel):
 
 class UserListResponse(BaseModel):
     """Response for listing users"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     users: List[UserDetail]
     total: int
     limit: int
@@ -54,6 +64,8 @@ class UserListResponse(BaseModel):
 
 class PhotoUploadResponse(BaseModel):
     """Response after successful photo upload"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     filename: str
     location: Dict[str, float]  # {"latitude": float, "longitude": float}
@@ -62,6 +74,14 @@ class PhotoUploadResponse(BaseModel):
     image_url: str
 
 
+class PhotoBulkUploadResponse(BaseModel):
+    """Response after a successful bulk photo upload"""
+    model_config = RESPONSE_MODEL_CONFIG
+
+    photos: List[PhotoUploadResponse]
+    total: int
+
+
 class PhotoLocationUpdate(BaseModel):
     """Request to update photo location"""
     latitude: float = Field(..., ge=-90, le=90, description="Latitude")
@@ -84,6 +104,8 @@ class PhotoLocationUpdate(BaseModel):
 
 class PhotoDetail(BaseModel):
     """Detailed photo information"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     user_id: str
     filename: str
@@ -99,6 +121,8 @@ class PhotoDetail(BaseModel):
 
 class PhotoListResponse(BaseModel):
     """Response for listing photos"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     photos: List[PhotoDetail]
     total: int
     limit: int
@@ -107,12 +131,16 @@ class PhotoListResponse(BaseModel):
 
 class PhotoDeleteResponse(BaseModel):
     """Response after photo deletion"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     success: bool
     message: str
 
 
 class HealthResponse(BaseModel):
     """Health check response"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     status: str
     version: str
     database: str
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, func
+from sqlalchemy import desc, asc, func, select
 from typing import Optional
 import logging
+import uuid
 
 from app.models import get_db, User, Photo
+from app.cache import mark_user_exists, forget_user
 from app.api.schemas import (
     UserCreate, UserUpdate, UserDetail, UserListResponse,
     PhotoListResponse, PhotoDetail
@@ -18,7 +21,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 # User CRUD Endpoints
 # ============================================================
 
-@router.get("", response_model=UserListResponse)
+@router.get("", responses={200: {"model": UserListResponse}})
 async def list_users(
     sort: str = Query("last_upload", description="Sort by: created_at, photo_count, last_upload, username"),
     order: str = Query("desc", description="Order: asc or desc"),
@@ -38,8 +41,8 @@ async def list_users(
     - search: Search term for username/display_name
     """
     try:
-        # Base query
-        query = db.query(User)
+        # Base query (total count computed in the same statement via a window function)
+        query = db.query(User, func.count().over().label("total"))
 
         # Apply search filter
         if search:
@@ -62,33 +65,32 @@ async def list_users(
         else:
             query = query.order_by(desc(sort_column))
 
-        # Get total count
-        total = query.count()
-
         # Apply pagination
-        users = query.offset(offset).limit(limit).all()
-
-        # Convert to response format
-        user_list = [
-            UserDetail(**user.to_dict(include_stats=True))
-            for user in users
-        ]
-
-        return UserListResponse(
-            users=user_list,
-            total=total,
-            limit=limit,
-            offset=offset
-        )
+        rows = query.offset(offset).limit(limit).all()
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page there is no row to carry the window count
+            total = query.with_entities(func.count(User.id)).order_by(None).scalar()
+        else:
+            total = 0
+
+        return ORJSONResponse({
+            "users": [user.to_dict(include_stats=True) for user, _ in rows],
+            "total": total,
+            "limit": limit,
+            "offset": offset
+        })
 
     except Exception as e:
         logger.error(f"Error listing users: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to list users: {str(e)}")
 
 
-@router.get("/{user_id}", response_model=UserDetail)
+@router.get("/{user_id}", responses={200: {"model": UserDetail}})
 async def get_user(
-    user_id: str,
+    user_id: uuid.UUID,
     db: Session = Depends(get_db)
 ):
     """
@@ -100,7 +102,7 @@ async def get_user(
         if not user:
             raise HTTPException(status_code=404, detail=f"User not found: {user_id}")
 
-        return UserDetail(**user.to_dict(include_stats=True))
+        return ORJSONResponse(user.to_dict(include_stats=True))
 
     except HTTPException:
         raise
@@ -109,7 +111,7 @@ async def get_user(
         raise HTTPException(status_code=500, detail=f"Failed to get user: {str(e)}")
 
 
-@router.post("", response_model=UserDetail, status_code=201)
+@router.post("", responses={201: {"model": UserDetail}}, status_code=201)
 async def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db)
@@ -145,9 +147,11 @@ async def create_user(
         db.commit()
         db.refresh(new_user)
 
+        await mark_user_exists(new_user.id)
+
         logger.info(f"Created user: {new_user.username} (id: {new_user.id})")
 
-        return UserDetail(**new_user.to_dict(include_stats=True))
+        return ORJSONResponse(new_user.to_dict(include_stats=True), status_code=201)
 
     except HTTPException:
         raise
@@ -157,9 +161,9 @@ async def create_user(
         raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
 
 
-@router.patch("/{user_id}", response_model=UserDetail)
+@router.patch("/{user_id}", responses={200: {"model": UserDetail}})
 async def update_user(
-    user_id: str,
+    user_id: uuid.UUID,
     user_data: UserUpdate,
     db: Session = Depends(get_db)
 ):
@@ -195,7 +199,7 @@ async def update_user(
 
         logger.info(f"Updated user: {user.username} (id: {user.id})")
 
-        return UserDetail(**user.to_dict(include_stats=True))
+        return ORJSONResponse(user.to_dict(include_stats=True))
 
     except HTTPException:
         raise
@@ -207,7 +211,7 @@ async def update_user(
 
 @router.delete("/{user_id}")
 async def delete_user(
-    user_id: str,
+    user_id: uuid.UUID,
     db: Session = Depends(get_db)
 ):
     """
@@ -224,6 +228,7 @@ async def delete_user(
 
         db.delete(user)
         db.commit()
+        await forget_user(user_id)
 
         logger.info(f"Deleted user: {username} (id: {user_id}) with {photo_count} photos")
 
@@ -245,9 +250,9 @@ async def delete_user(
 # User Photos Endpoints
 # ============================================================
 
-@router.get("/{user_id}/photos", response_model=PhotoListResponse)
+@router.get("/{user_id}/photos", responses={200: {"model": PhotoListResponse}})
 async def list_user_photos(
-    user_id: str,
+    user_id: uuid.UUID,
     limit: int = Query(100, ge=1, le=500, description="Maximum number of photos to return"),
     offset: int = Query(0, ge=0, description="Number of photos to skip"),
     sort: str = Query("upload_date", description="Sort by: upload_date or file_size"),
@@ -271,19 +276,18 @@ async def list_user_photos(
         if not user:
             raise HTTPException(status_code=404, detail=f"User not found: {user_id}")
 
-        # Base query
-        query = db.query(Photo).filter(Photo.user_id == user_id)
+        # Base filter
+        filters = [Photo.user_id == user_id]
 
         # Apply geographic bounds filter if provided
         if bounds:
             try:
                 north, south, east, west = map(float, bounds.split(','))
-                query = query.filter(
-                    Photo.latitude >= south,
-                    Photo.latitude <= north,
-                    Photo.longitude >= west,
-                    Photo.longitude <= east
-                )
+                # Bounding-box test on the GIST-indexed location column
+                filters.append(func.ST_Intersects(
+                    Photo.location,
+                    func.ST_MakeEnvelope(west, south, east, north, 4326)
+                ))
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid bounds format. Use: north,south,east,west")
 
@@ -293,29 +297,30 @@ async def list_user_photos(
             "file_size": Photo.file_size
         }.get(sort, Photo.upload_date)
 
-        if order == "asc":
-            query = query.order_by(asc(sort_column))
-        else:
-            query = query.order_by(desc(sort_column))
+        order_by = asc(sort_column) if order == "asc" else desc(sort_column)
 
-        # Get total count
-        total = query.count()
+        # Apply pagination, selecting plain rows instead of ORM instances;
+        # the total count rides along as a window function column
+        rows = db.execute(
+            select(*Photo.LIST_COLUMNS, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(order_by)
+            .offset(offset)
+            .limit(limit)
+        ).all()
 
-        # Apply pagination
-        photos = query.offset(offset).limit(limit).all()
-
-        # Convert to response format
-        photo_list = [
-            PhotoDetail(**photo.to_dict(include_user=False))
-            for photo in photos
-        ]
-
-        return PhotoListResponse(
-            photos=photo_list,
-            total=total,
-            limit=limit,
-            offset=offset
-        )
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page there is no row to carry the window count
+            total = db.query(func.count(Photo.id)).filter(*filters).scalar() if offset else 0
+
+        return ORJSONResponse({
+            "photos": [Photo.row_to_dict(row) for row in rows],
+            "total": total,
+            "limit": limit,
+            "offset": offset
+        })
 
     except HTTPException:
         raise
@@ -0,0 +1,90 @@
+"""
+User existence cache for the upload hot path.
+
+Uploads only need to know that ``user_id`` refers to an existing user before
+writing files. Positive answers are cached in-process (and in Redis when
+USE_REDIS is enabled) so most uploads skip the users lookup; the photos.user_id
+foreign key remains the source of truth for users deleted while cached.
+"""
+import logging
+import time
+import uuid
+from typing import Dict
+
+import redis.asyncio as aioredis
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+USER_EXISTS_TTL = 60  # seconds
+USER_EXISTS_MAXSIZE = 10_000
+
+# user_id -> monotonic expiry time (only existing users are cached)
+_user_exists: Dict[uuid.UUID, float] = {}
+_redis = aioredis.from_url(settings.REDIS_URL) if settings.USE_REDIS else None
+
+
+def _redis_key(user_id: uuid.UUID) -> str:
+    return f"user:exists:{user_id}"
+
+
+def _remember_local(user_id: uuid.UUID) -> None:
+    if len(_user_exists) >= USER_EXISTS_MAXSIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _user_exists.pop(next(iter(_user_exists)))
+    _user_exists[user_id] = time.monotonic() + USER_EXISTS_TTL
+
+
+async def mark_user_exists(user_id: uuid.UUID) -> None:
+    """Record that a user exists (e.g. right after creating it)"""
+    _remember_local(user_id)
+    if _redis is not None:
+        try:
+            await _redis.set(_redis_key(user_id), 1, ex=USER_EXISTS_TTL)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for user cache: {e}")
+
+
+async def forget_user(user_id: uuid.UUID) -> None:
+    """Drop a user from the cache (e.g. after deleting it)"""
+    _user_exists.pop(user_id, None)
+    if _redis is not None:
+        try:
+            await _redis.delete(_redis_key(user_id))
+        except Exception as e:
+            logger.warning(f"Redis unavailable for user cache: {e}")
+
+
+async def user_exists(user_id: uuid.UUID, db: Session) -> bool:
+    """
+    Check whether a user exists, consulting the cache before the database.
+
+    Args:
+        user_id: User ID to check
+        db: Session used on a cache miss
+
+    Returns:
+        True if the user exists (or did within the last USER_EXISTS_TTL seconds)
+    """
+    expires_at = _user_exists.get(user_id)
+    if expires_at is not None:
+        if expires_at > time.monotonic():
+            return True
+        del _user_exists[user_id]
+
+    if _redis is not None:
+        try:
+            if await _redis.exists(_redis_key(user_id)):
+                _remember_local(user_id)
+                return True
+        except Exception as e:
+            logger.warning(f"Redis unavailable for user cache: {e}")
+
+    exists = db.query(db.query(User.id).filter(User.id == user_id).exists()).scalar()
+    if exists:
+        await mark_user_exists(user_id)
+    return exists
@@ -30,6 +30,13 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8080"]
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
 
+    # File serving: when set, image/thumbnail routes return an X-Accel-Redirect to this
+    # nginx `internal` location prefix instead of streaming the file through Python
+    X_ACCEL_REDIRECT_PREFIX: str = os.getenv("X_ACCEL_REDIRECT_PREFIX", "")
+
+    # Video thumbnails: decode/scale with ffmpeg's CUDA hwaccel (falls back to CPU on failure)
+    FFMPEG_HWACCEL: bool = os.getenv("FFMPEG_HWACCEL", "false").lower() == "true"
+
     # Processing parameters
     ANGLE_THRESHOLD: float = 10.0  # degrees
     CURVATURE_SAMPLES: int = 50
@@ -53,6 +60,9 @@ class Settings(BaseSettings):
     MAX_CANDIDATE_LIMIT: int = 1000
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds
+    # Seconds; only connections idle at least this long are pinged on checkout
+    DATABASE_PING_AFTER_IDLE: int = 30
 
     # Seongsu-specific settings
     SEONGSU_MODE: bool = os.getenv("SEONGSU_MODE", "false").lower() == "true"
@@ -1,26 +1,171 @@
 """
 Logging configuration for Route Similarity API
 """
+import atexit
+import copy
+import io
 import logging
+import os
 import sys
-from typing import Any, Dict
+import threading
+import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any, Optional
 
+import orjson
 
-def setup_logging(level: str = "INFO", format_type: str = "json") -> None:
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+
+    The constant parts of the object are precomputed byte pieces; timestamp,
+    level and logger name never need escaping and are spliced in as-is, so only the
+    message (and traceback, if any) goes through orjson for escaping. Unlike a
+    %-style JSON template, quotes and newlines in messages stay valid JSON.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pieces = (
+            b'{"timestamp":"',
+            b'","level":"',
+            b'","logger":"',
+            b'","message":',
+        )
+        self._exception_piece = b',"exception":'
+        # (whole second, formatted date/time) of the last record
+        self._cached_second = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Same output as logging.Formatter, but strftime runs at most once per second"""
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached_second
+        if second != cached_second:
+            formatted = time.strftime(self.default_time_format, self.converter(second))
+            self._cached_second = (second, formatted)
+        return self.default_msec_format % (formatted, record.msecs)
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp_piece, level_piece, logger_piece, message_piece = self._pieces
+        line = bytearray(timestamp_piece)
+        line += self.formatTime(record).encode("ascii")
+        line += level_piece
+        line += record.levelname.encode("ascii")
+        line += logger_piece
+        line += record.name.encode()
+        line += message_piece
+        line += orjson.dumps(record.getMessage())
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line += self._exception_piece
+            line += orjson.dumps(record.exc_text)
+        line += b"}"
+        return line.decode("utf-8")
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Enqueue records for the listener thread without formatting them.
+
+    The stock QueueHandler renders the whole record into the message before
+    enqueueing; this only merges the args and renders any traceback, leaving
+    the output format to the listener's handler.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class PeriodicFlushHandler(logging.StreamHandler):
+    """
+    StreamHandler for a block-buffered stream, flushed on a timer.
+
+    Records accumulate in the stream's buffer and reach the file descriptor
+    in batches (every flush_interval seconds, or when the buffer fills)
+    instead of one write() per record.
+    """
+
+    def __init__(self, stream: io.TextIOBase, flush_interval: float = 0.2) -> None:
+        super().__init__(stream)
+        self.flush_interval = flush_interval
+        self._stop_flushing = threading.Event()
+        threading.Thread(target=self._flush_periodically, name="log-flush", daemon=True).start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop_flushing.set()
+        self.flush()
+        super().close()
+
+
+def _buffered_stdout(buffer_size: int = 64 * 1024) -> io.TextIOBase:
+    """A separately buffered text stream over the stdout file descriptor"""
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        # stdout replaced by something without a descriptor (e.g. test capture)
+        return sys.stdout
+    return open(fd, "w", buffering=buffer_size, encoding="utf-8", closefd=False)
+
+
+# Background thread writing queued records to stdout (set by setup_logging)
+listener: Optional[QueueListener] = None
+
+
+def stop_listener() -> None:
+    """Drain the log queue and flush buffered output"""
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _log_directly_after_fork() -> None:
+    """Forked workers (e.g. the thumbnail pool) have no listener or flush thread; write directly"""
+    if listener is not None:
+        buffered_handler = listener.handlers[0]
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setLevel(buffered_handler.level)
+        handler.setFormatter(buffered_handler.formatter)
+        logging.getLogger().handlers = [handler]
+
+
+os.register_at_fork(after_in_child=_log_directly_after_fork)
+
+
+def setup_logging(level: str = "INFO", format_type: str = "json", access_log: bool = False) -> None:
     """
     Configure application logging.
 
+    Records are handed to a queue and written to stdout by a single listener
+    thread, so logging callers never block on the write; the listener writes
+    into a 64 KiB buffer that is flushed every 200 ms.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         format_type: Format type ('json' or 'text')
+        access_log: Keep uvicorn's per-request access log (disabled by default)
     """
     log_level = getattr(logging, level.upper(), logging.INFO)
 
     if format_type == "json":
-        formatter = logging.Formatter(
-            '{"timestamp": "%(asctime)s", "level": "%(levelname)s", '
-            '"logger": "%(name)s", "message": "%(message)s"}'
-        )
+        formatter = OrjsonFormatter()
     else:
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -33,21 +178,38 @@ def setup_logging(level: str = "INFO", format_type: str = "json") -> None:
     # Remove existing handlers
     root_logger.handlers = []
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    # Console handler, fed from the queue by the listener thread
+    console_handler = PeriodicFlushHandler(_buffered_stdout())
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
 
-    # Suppress noisy third-party loggers
-    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    global listener
+    if listener is not None:
+        stop_listener()
+    else:
+        atexit.register(stop_listener)
+
+    log_queue: SimpleQueue = SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    root_logger.addHandler(LogQueueHandler(log_queue))
+
+    # Suppress noisy third-party loggers. A disabled logger drops calls before a
+    # LogRecord is even created, so access logging costs nothing per request.
+    access_logger = logging.getLogger("uvicorn.access")
+    access_logger.setLevel(logging.INFO if access_log else logging.WARNING)
+    access_logger.disabled = not access_log
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance.
 
+    Cached per name (loggers live for the whole process anyway), so repeated
+    calls skip the logging module lock and registry lookup.
+
     Args:
         name: Logger name (typically __name__)
 
@@ -1,45 +1,77 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from app.api import routes, user_routes
 from app.config import get_settings
 from app.logging_config import setup_logging
+from app.middleware import CORSPreflightMiddleware
 import os
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 
 settings = get_settings()
 
 # Setup logging
 log_level = os.getenv("LOG_LEVEL", "INFO")
 log_format = os.getenv("LOG_FORMAT", "text")
-setup_logging(level=log_level, format_type=log_format)
+access_log = os.getenv("ACCESS_LOG", "false").lower() in ("1", "true")
+setup_logging(level=log_level, format_type=log_format, access_log=access_log)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Process pool for CPU-bound thumbnail generation (PIL decode/resize escapes the GIL)
+    app.state.thumbnail_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    yield
+    app.state.thumbnail_pool.shutdown()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Photo Archive API",
     description="Geographic photo archiving system with map-based organization",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS - configured based on environment
+# A frozenset so CORSMiddleware's per-request `origin in allow_origins` check is a hash lookup
+cors_origins = frozenset(settings.get_cors_origins())
+cors_methods = ["GET", "POST", "PUT", "PATCH", "DELETE"]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.get_cors_origins(),
+    allow_origins=cors_origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_methods=cors_methods,
     allow_headers=["*"],
 )
+# Added last so it runs first: allowed preflights are answered without entering the app
+app.add_middleware(
+    CORSPreflightMiddleware,
+    allow_origins=cors_origins,
+    allow_credentials=True,
+    allow_methods=cors_methods,
+)
 
 # Include routers
 app.include_router(routes.router, prefix=settings.API_V1_PREFIX, tags=["photos"])
 app.include_router(user_routes.router, prefix=settings.API_V1_PREFIX)
 
+# Static body, serialized once. A fresh Response is still built per request because
+# middleware (e.g. CORSMiddleware) edits the response headers in place.
+ROOT_BODY = orjson.dumps({
+    "message": "Photo Archive API",
+    "docs": "/docs",
+    "health": f"{settings.API_V1_PREFIX}/health"
+})
+
+
 @app.get("/")
 async def root():
-    return {
-        "message": "Photo Archive API",
-        "docs": "/docs",
-        "health": f"{settings.API_V1_PREFIX}/health"
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
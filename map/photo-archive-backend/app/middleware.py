@@ -0,0 +1,79 @@
+"""
+ASGI middleware for the Photo Archive API
+"""
+from typing import Iterable, List, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class CORSPreflightMiddleware:
+    """
+    Answer allowed CORS preflight requests before the rest of the stack.
+
+    A raw ASGI middleware (no Request/Response objects): the preflight headers
+    are encoded once at startup, and only the echoed origin and requested
+    headers are added per preflight. Anything that isn't an allowed preflight
+    (including disallowed origins/methods, which CORSMiddleware rejects with a
+    400) falls through unchanged, so CORSMiddleware still handles simple
+    requests. Every request header is allowed, matching allow_headers=["*"].
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Iterable[str],
+        allow_methods: Iterable[str],
+        allow_credentials: bool = False,
+        max_age: int = 600,
+    ) -> None:
+        self.app = app
+        self.allow_origins = frozenset(allow_origins)
+        self.allow_all_origins = "*" in self.allow_origins
+        self.allow_methods = frozenset(allow_methods)
+        # With credentials a wildcard origin isn't honoured by browsers; echo the origin
+        self.echo_origin = not self.allow_all_origins or allow_credentials
+
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"content-length", b"0"),
+        ]
+        if self.echo_origin:
+            headers.append((b"vary", b"Origin"))
+        else:
+            headers.append((b"access-control-allow-origin", b"*"))
+        if allow_credentials:
+            headers.append((b"access-control-allow-credentials", b"true"))
+        self.preflight_headers = headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        origin = requested_method = requested_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                requested_method = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+
+        if (
+            origin is None
+            or requested_method is None
+            or requested_method.decode("latin-1") not in self.allow_methods
+            or not (self.allow_all_origins or origin.decode("latin-1") in self.allow_origins)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = list(self.preflight_headers)
+        if self.echo_origin:
+            headers.append((b"access-control-allow-origin", origin))
+        if requested_headers is not None:
+            headers.append((b"access-control-allow-headers", requested_headers))
+
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
@@ -1,24 +1,85 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON, func
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import (
+    create_engine, event, make_url, MetaData, Column, Integer, String, Float, DateTime, JSON, func
+)
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import QueuePool
 from geoalchemy2 import Geometry
 from datetime import datetime, timezone
 from app.config import get_settings
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Create engine with connection pooling
+# psycopg 3 driver; plain postgresql:// URLs would otherwise select psycopg2
+database_url = make_url(settings.DATABASE_URL)
+if database_url.drivername == "postgresql":
+    database_url = database_url.set(drivername="postgresql+psycopg")
+
+# Create engine with connection pooling.
+# No pre-ping round-trip per checkout (see check_connection_on_checkout); connections
+# are also recycled before server/proxy idle timeouts.
 engine = create_engine(
-    settings.DATABASE_URL,
+    database_url,
+    poolclass=QueuePool,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_pre_ping=True,  # Verify connections before using
+    pool_pre_ping=False,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,  # Replace before server/proxy idle timeouts
+    pool_use_lifo=True,  # Reuse the most recently returned connection so a small set stays warm
     echo=False,  # Set to True for SQL debugging
 )
 
+
+@event.listens_for(engine, "checkin")
+def record_checkin_time(dbapi_connection, connection_record):
+    connection_record.info["checked_in_at"] = time.monotonic()
+
+
+@event.listens_for(engine, "checkout")
+def check_connection_on_checkout(dbapi_connection, connection_record, connection_proxy):
+    """
+    Verify pooled connections only when they might have gone stale.
+
+    Connections psycopg already knows are broken are replaced for free. A
+    SELECT 1 is only sent for connections idle longer than
+    DATABASE_PING_AFTER_IDLE seconds; with LIFO checkout the busy working set
+    never idles that long, so the healthy hot path adds no round-trip. Raising
+    DisconnectionError makes the pool discard the connection and retry the
+    checkout with a new one.
+    """
+    if dbapi_connection.closed or dbapi_connection.broken:
+        raise DisconnectionError("Connection closed while pooled")
+
+    checked_in_at = connection_record.info.get("checked_in_at")
+    if checked_in_at is None:
+        return
+    if time.monotonic() - checked_in_at < settings.DATABASE_PING_AFTER_IDLE:
+        return
+
+    try:
+        engine.dialect.do_ping(dbapi_connection)
+    except engine.dialect.loaded_dbapi.Error as e:
+        if engine.dialect.is_disconnect(e, dbapi_connection, None):
+            raise DisconnectionError(f"Stale pooled connection: {e}") from e
+        raise
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+
+
+class Base(DeclarativeBase):
+    # Constraint/index names matching PostgreSQL's defaults and the idx_ names in schema.sql
+    metadata = MetaData(naming_convention={
+        "ix": "idx_%(table_name)s_%(column_0_name)s",
+        "uq": "%(table_name)s_%(column_0_name)s_key",
+        "ck": "%(table_name)s_%(constraint_name)s_check",
+        "fk": "%(table_name)s_%(column_0_name)s_fkey",
+        "pk": "%(table_name)s_pkey",
+    })
+
 
 def get_db():
     """Database session dependency for FastAPI"""
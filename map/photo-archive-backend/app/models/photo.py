@@ -1,8 +1,27 @@
-from sqlalchemy import Column, String, Float, DateTime, Integer, JSON, func, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import String, Float, DateTime, Integer, func, ForeignKey, Computed, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from geoalchemy2 import Geometry
 from app.models.database import Base
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
 import uuid
-from datetime import datetime, timezone
+import orjson
+from ulid import ULID
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+def new_photo_id() -> uuid.UUID:
+    """
+    Generate a time-ordered photo ID.
+
+    A ULID as a UUID: interchangeable with the existing uuid4 IDs, but
+    increasing over time so inserts append to the right edge of the primary
+    key index instead of landing on random pages.
+    """
+    return ULID().to_uuid()
 
 
 class Photo(Base):
@@ -10,38 +29,70 @@ class Photo(Base):
     Photo model for storing uploaded images with geographic location.
 
     Each photo has:
-    - Unique identifier (UUID)
+    - Unique identifier (time-ordered UUID, see new_photo_id)
     - File storage information (filename, path, size, type)
-    - Geographic location (latitude, longitude)
+    - Geographic location (latitude, longitude, derived PostGIS point)
     - Optional metadata (EXIF data, tags, etc.)
     - Timestamps for tracking
     """
     __tablename__ = "photos"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    filename = Column(String(255), nullable=False)
-    storage_path = Column(String(512), nullable=False)
-    thumbnail_path = Column(String(512))
+    # API URL templates, filled with the photo ID via %
+    THUMBNAIL_URL_FORMAT = "/api/v1/photos/%s/thumbnail"
+    IMAGE_URL_FORMAT = "/api/v1/photos/%s/image"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=new_photo_id
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE')
+    )
+    filename: Mapped[str] = mapped_column(String(255))
+    storage_path: Mapped[str] = mapped_column(String(512))
+    thumbnail_path: Mapped[Optional[str]] = mapped_column(String(512))
 
     # Geographic location
-    latitude = Column(Float, nullable=False)
-    longitude = Column(Float, nullable=False)
+    latitude: Mapped[float] = mapped_column(Float)
+    longitude: Mapped[float] = mapped_column(Float)
+    # PostGIS point generated by the database from latitude/longitude (GIST-indexed);
+    # deferred so regular loads don't fetch it
+    location: Mapped[Optional[Any]] = mapped_column(
+        Geometry(geometry_type='POINT', srid=4326, spatial_index=True),
+        Computed("ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)", persisted=True),
+        deferred=True
+    )
 
     # File information
-    file_size = Column(Integer, nullable=False)  # Size in bytes
-    mime_type = Column(String(100), nullable=False)
+    file_size: Mapped[int] = mapped_column(Integer)  # Size in bytes
+    mime_type: Mapped[str] = mapped_column(String(100))
 
     # Optional metadata (EXIF data, user tags, etc.)
-    photo_metadata = Column(JSON)
+    photo_metadata: Mapped[Optional[dict]] = mapped_column(JSONB)
 
     # Timestamps
-    upload_date = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    upload_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
 
     # Relationships
-    user = relationship("User", backref="photos")
+    # Lazy per instance on purpose: single-photo routes (image/thumbnail serving)
+    # never touch the user. Queries that serialize many photos with
+    # to_dict(include_user=True) must add .options(selectinload(Photo.user)) so
+    # all users come from one IN (...) query instead of one query per photo.
+    user: Mapped["User"] = relationship(backref="photos")
+
+    __table_args__ = (
+        # A user's photos newest first (gallery pagination) as one index range scan
+        Index("idx_photos_user_upload", user_id, upload_date.desc()),
+        # Containment/key lookups on metadata (EXIF tags etc.): photo_metadata @> '{...}'
+        Index("idx_photos_metadata", photo_metadata, postgresql_using="gin"),
+    )
 
     def __repr__(self):
         return f"<Photo(id={self.id}, filename={self.filename}, location=({self.latitude}, {self.longitude}))>"
@@ -50,26 +101,71 @@ class Photo(Base):
         """
         Convert photo model to dictionary for API responses.
 
+        Datetimes are left as datetime objects; orjson formats them as
+        ISO 8601 when the response is serialized.
+
         Args:
-            include_user: Include minimal user information
+            include_user: Include minimal user information (load lists of
+                photos with selectinload(Photo.user) to avoid N+1 queries)
         """
+        photo_id = str(self.id)
         result = {
-            "id": self.id,
-            "user_id": self.user_id,
+            "id": photo_id,
+            "user_id": str(self.user_id),
             "filename": self.filename,
             "location": {
                 "latitude": self.latitude,
                 "longitude": self.longitude
             },
-            "upload_date": self.upload_date.isoformat() if self.upload_date else None,
+            "upload_date": self.upload_date,
             "file_size": self.file_size,
             "mime_type": self.mime_type,
             "metadata": self.photo_metadata,
-            "thumbnail_url": f"/api/v1/photos/{self.id}/thumbnail" if self.thumbnail_path else None,
-            "image_url": f"/api/v1/photos/{self.id}/image"
+            "thumbnail_url": self.THUMBNAIL_URL_FORMAT % photo_id if self.thumbnail_path else None,
+            "image_url": self.IMAGE_URL_FORMAT % photo_id
         }
 
         if include_user and self.user:
             result["user"] = self.user.to_dict_minimal()
 
         return result
+
+    def to_bytes(self, include_user=False) -> bytes:
+        """
+        Serialize to_dict() straight to JSON bytes for a raw Response body.
+
+        Args:
+            include_user: Include minimal user information
+        """
+        return orjson.dumps(self.to_dict(include_user), option=orjson.OPT_NAIVE_UTC)
+
+    @classmethod
+    def row_to_dict(cls, row):
+        """
+        Convert a row selected with LIST_COLUMNS to the same shape as to_dict().
+
+        Lets list endpoints skip ORM instance construction entirely.
+        """
+        photo_id = str(row.id)
+        return {
+            "id": photo_id,
+            "user_id": str(row.user_id),
+            "filename": row.filename,
+            "location": {
+                "latitude": row.latitude,
+                "longitude": row.longitude
+            },
+            "upload_date": row.upload_date,
+            "file_size": row.file_size,
+            "mime_type": row.mime_type,
+            "metadata": row.photo_metadata,
+            "thumbnail_url": cls.THUMBNAIL_URL_FORMAT % photo_id if row.thumbnail_path else None,
+            "image_url": cls.IMAGE_URL_FORMAT % photo_id
+        }
+
+
+# Columns needed to serialize a photo for list endpoints (see row_to_dict)
+Photo.LIST_COLUMNS = (
+    Photo.id, Photo.user_id, Photo.filename, Photo.latitude, Photo.longitude, Photo.upload_date,
+    Photo.file_size, Photo.mime_type, Photo.photo_metadata, Photo.thumbnail_path
+)
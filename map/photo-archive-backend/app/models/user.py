@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Integer, BigInteger, DateTime, JSON, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import String, Integer, BigInteger, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from app.models.database import Base
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
+from typing import Optional
 
 
 class User(Base):
@@ -18,25 +20,32 @@ class User(Base):
     """
     __tablename__ = "users"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    username = Column(String(100), unique=True, nullable=False, index=True)
-    display_name = Column(String(255), nullable=False)
-    email = Column(String(255), unique=True)
+    # API URL template, filled with the user ID via %
+    AVATAR_URL_FORMAT = "/api/v1/users/%s/avatar"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    username: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    display_name: Mapped[str] = mapped_column(String(255))
+    email: Mapped[Optional[str]] = mapped_column(String(255), unique=True)
 
     # User avatar/profile
-    avatar_path = Column(String(512))
+    avatar_path: Mapped[Optional[str]] = mapped_column(String(512))
 
     # Statistics (denormalized for performance, updated via triggers)
-    photo_count = Column(Integer, default=0, nullable=False)
-    total_storage_bytes = Column(BigInteger, default=0, nullable=False)
+    photo_count: Mapped[int] = mapped_column(Integer, default=0)
+    total_storage_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
 
     # Metadata
-    user_metadata = Column(JSON)
+    user_metadata: Mapped[Optional[dict]] = mapped_column(JSONB)
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    last_upload_at = Column(DateTime(timezone=True))
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    last_upload_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     # Relationships
     # Note: photos relationship is defined via foreign key in Photo model
@@ -47,25 +56,28 @@ class User(Base):
 
     def to_dict(self, include_stats=True):
         """
-        Convert user model to dictionary for API responses.
+        Convert user model to dictionary for API responses (datetimes are
+        formatted by orjson at serialization time).
 
         Args:
             include_stats: Include photo count and storage statistics
         """
+        user_id = str(self.id)
         result = {
-            "id": self.id,
+            "id": user_id,
             "username": self.username,
             "display_name": self.display_name,
             "email": self.email,
-            "avatar_url": f"/api/v1/users/{self.id}/avatar" if self.avatar_path else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "avatar_url": self.AVATAR_URL_FORMAT % user_id if self.avatar_path else None,
+            "created_at": self.created_at,
         }
 
         if include_stats:
+            # Trigger-maintained columns (migrations 002/004), so no per-user aggregate query
             result.update({
                 "photo_count": self.photo_count,
                 "total_storage_bytes": self.total_storage_bytes,
-                "last_upload_at": self.last_upload_at.isoformat() if self.last_upload_at else None,
+                "last_upload_at": self.last_upload_at,
             })
 
         return result
@@ -75,7 +87,7 @@ class User(Base):
         Minimal user info for embedding in photo responses.
         """
         return {
-            "id": self.id,
+            "id": str(self.id),
             "username": self.username,
             "display_name": self.display_name,
         }
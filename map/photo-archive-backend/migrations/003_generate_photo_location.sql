@@ -0,0 +1,29 @@
+-- Migration: Derive photos.location from latitude/longitude for indexed bounds queries
+-- Version: 003
+-- Date: 2026-10-15
+
+-- ============================================================
+-- STEP 1: Replace location with a generated column
+-- ============================================================
+
+-- The application only writes latitude/longitude; let PostgreSQL keep the
+-- PostGIS point in sync so every row is covered by the GIST index.
+DROP INDEX IF EXISTS idx_photos_location;
+
+ALTER TABLE photos
+DROP COLUMN IF EXISTS location;
+
+ALTER TABLE photos
+ADD COLUMN location GEOMETRY(POINT, 4326)
+    GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)) STORED;
+
+-- ============================================================
+-- STEP 2: Spatial index for bounding-box filters
+-- ============================================================
+
+CREATE INDEX idx_photos_location ON photos USING GIST(location);
+
+-- Example: photos of a user inside a bounding box (index-assisted)
+-- SELECT * FROM photos
+-- WHERE user_id = :user_id
+--   AND ST_Intersects(location, ST_MakeEnvelope(:west, :south, :east, :north, 4326));
@@ -0,0 +1,47 @@
+-- Migration: Keep user statistics correct when photo rows are updated
+-- Version: 004
+-- Date: 2026-10-15
+
+-- Migration 002 maintains users.photo_count / total_storage_bytes /
+-- last_upload_at on INSERT and DELETE of photos, so listing users never has
+-- to aggregate photos. This adds the missing UPDATE path (file size changes
+-- and photos moved between users).
+
+-- ============================================================
+-- STEP 1: Trigger function for photo updates
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION update_user_stats_on_photo_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.user_id IS DISTINCT FROM OLD.user_id THEN
+        UPDATE users
+        SET
+            photo_count = GREATEST(photo_count - 1, 0),
+            total_storage_bytes = GREATEST(total_storage_bytes - OLD.file_size, 0)
+        WHERE id = OLD.user_id;
+
+        UPDATE users
+        SET
+            photo_count = photo_count + 1,
+            total_storage_bytes = total_storage_bytes + NEW.file_size,
+            last_upload_at = GREATEST(last_upload_at, NEW.upload_date)
+        WHERE id = NEW.user_id;
+    ELSE
+        UPDATE users
+        SET total_storage_bytes = GREATEST(total_storage_bytes - OLD.file_size + NEW.file_size, 0)
+        WHERE id = NEW.user_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================
+-- STEP 2: Attach trigger
+-- ============================================================
+
+CREATE TRIGGER photo_update_update_user_stats
+    AFTER UPDATE OF file_size, user_id ON photos
+    FOR EACH ROW
+    WHEN (OLD.file_size IS DISTINCT FROM NEW.file_size OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+    EXECUTE FUNCTION update_user_stats_on_photo_update();
@@ -0,0 +1,75 @@
+-- Migration: Store user and photo IDs as native UUID instead of VARCHAR(36)
+-- Version: 005
+-- Date: 2026-10-15
+
+-- UUID is 16 bytes versus 37 for the text form, which shrinks users_pkey,
+-- photos_pkey and every index containing photos.user_id, and turns key
+-- comparisons into fixed-width binary compares.
+
+-- IDs that aren't UUIDs (the 'default-user-000000000000' user from migration
+-- 002) are mapped deterministically: the default user becomes the nil UUID,
+-- anything else becomes md5(id) read as a UUID.
+
+-- Every USING clause works on the text form (col::text), so a column that is
+-- already UUID (e.g. photos.id as created by schema.sql) converts to itself and
+-- the migration can be re-run.
+
+-- ============================================================
+-- STEP 1: Drop the foreign key and the column-dependent trigger
+-- so both sides can change type
+-- ============================================================
+
+ALTER TABLE photos DROP CONSTRAINT IF EXISTS photos_user_id_fkey;
+
+-- photo_update_update_user_stats (migration 004) names user_id in its
+-- UPDATE OF / WHEN clauses; PostgreSQL refuses to change the type of a column
+-- used in a trigger definition. The other photo/user triggers don't reference
+-- columns and can stay.
+DROP TRIGGER IF EXISTS photo_update_update_user_stats ON photos;
+
+-- ============================================================
+-- STEP 2: Convert columns
+-- ============================================================
+
+ALTER TABLE users
+ALTER COLUMN id TYPE UUID USING (
+    CASE
+        WHEN id::text = 'default-user-000000000000' THEN '00000000-0000-0000-0000-000000000000'::uuid
+        WHEN id::text ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN id::text::uuid
+        ELSE md5(id::text)::uuid
+    END
+);
+
+ALTER TABLE photos
+ALTER COLUMN user_id TYPE UUID USING (
+    CASE
+        WHEN user_id::text = 'default-user-000000000000' THEN '00000000-0000-0000-0000-000000000000'::uuid
+        WHEN user_id::text ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN user_id::text::uuid
+        ELSE md5(user_id::text)::uuid
+    END
+);
+
+ALTER TABLE photos
+ALTER COLUMN id TYPE UUID USING (
+    CASE
+        WHEN id::text ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN id::text::uuid
+        ELSE md5(id::text)::uuid
+    END
+);
+
+-- ============================================================
+-- STEP 3: Restore the foreign key and trigger
+-- ============================================================
+
+ALTER TABLE photos
+ADD CONSTRAINT photos_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+CREATE TRIGGER photo_update_update_user_stats
+    AFTER UPDATE OF file_size, user_id ON photos
+    FOR EACH ROW
+    WHEN (OLD.file_size IS DISTINCT FROM NEW.file_size OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+    EXECUTE FUNCTION update_user_stats_on_photo_update();
+
+-- Indexes on the converted columns (photos_pkey, users_pkey, idx_photos_user_id,
+-- idx_photos_user_upload) are rebuilt by ALTER COLUMN TYPE.
@@ -0,0 +1,17 @@
+-- Migration: GIN index on photos.photo_metadata
+-- Version: 006
+-- Date: 2026-10-15
+
+-- photos.photo_metadata and users.user_metadata are already JSONB (schema.sql,
+-- migration 002), so values are stored pre-parsed. This makes metadata filters
+-- such as EXIF tag lookups index-assisted instead of scanning every row.
+
+-- ============================================================
+-- STEP 1: Index metadata for containment and key-existence queries
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_photos_metadata ON photos USING GIN(photo_metadata);
+
+-- Example: photos taken with a given camera (index-assisted)
+-- SELECT * FROM photos
+-- WHERE photo_metadata @> '{"camera": "X100V"}';
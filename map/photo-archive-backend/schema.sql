@@ -9,7 +9,7 @@ DROP TABLE IF EXISTS photos CASCADE;
 
 -- Photos table: stores uploaded images with geographic location
 CREATE TABLE photos (
-    id VARCHAR(36) PRIMARY KEY,
+    id UUID PRIMARY KEY,
     filename VARCHAR(255) NOT NULL,
     storage_path VARCHAR(512) NOT NULL,
     thumbnail_path VARCHAR(512),
@@ -17,7 +17,8 @@ CREATE TABLE photos (
     -- Geographic location
     latitude DOUBLE PRECISION NOT NULL,
     longitude DOUBLE PRECISION NOT NULL,
-    location GEOMETRY(POINT, 4326) NOT NULL,
+    location GEOMETRY(POINT, 4326)
+        GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)) STORED,
 
     -- File information
     file_size INTEGER NOT NULL,
@@ -75,6 +76,11 @@ CREATE TRIGGER update_photos_updated_at
 -- )
 -- ORDER BY distance;
 
+-- Nearest photos to a point (KNN, walks the GIST index)
+-- SELECT * FROM photos
+-- ORDER BY location <-> ST_SetSRID(ST_MakePoint(target_longitude, target_latitude), 4326)
+-- LIMIT 10;
+
 -- Count photos in area
 -- SELECT COUNT(*) FROM photos
 -- WHERE ST_Contains(
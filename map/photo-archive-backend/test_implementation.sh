@@ -84,12 +84,12 @@ test_endpoint "POST" "/users" "$NEW_USER_DATA" "Create new user"
 # Test 4: Get User Details
 echo "4. USER MANAGEMENT - Get User Details"
 # Get the default user
-test_endpoint "GET" "/users/default-user-000000000000" "" "Get default Anonymous user"
+test_endpoint "GET" "/users/00000000-0000-0000-0000-000000000000" "" "Get default Anonymous user"
 
 # Test 5: List User Photos
 echo "5. PHOTO MANAGEMENT - List User Photos"
-test_endpoint "GET" "/users/default-user-000000000000/photos" "" "List photos for Anonymous user"
-test_endpoint "GET" "/users/default-user-000000000000/photos?limit=5" "" "List photos with limit"
+test_endpoint "GET" "/users/00000000-0000-0000-0000-000000000000/photos" "" "List photos for Anonymous user"
+test_endpoint "GET" "/users/00000000-0000-0000-0000-000000000000/photos?limit=5" "" "List photos with limit"
 
 # Test 6: Test Photo Upload (would require multipart/form-data)
 echo "6. PHOTO UPLOAD"
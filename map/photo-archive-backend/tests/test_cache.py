@@ -0,0 +1,101 @@
+"""
+Tests for the in-process user existence cache
+"""
+import uuid
+
+import pytest
+
+from app import cache
+
+
+class FakeSession:
+    """Answers the users lookup made on a cache miss and counts the queries"""
+
+    def __init__(self, exists: bool):
+        self.exists_result = exists
+        self.queries = 0
+
+    def query(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def exists(self):
+        return self
+
+    def scalar(self):
+        self.queries += 1
+        return self.exists_result
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "_redis", None)
+    monkeypatch.setattr(cache, "_user_exists", {})
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+async def test_existing_user_is_cached():
+    user_id = uuid.uuid4()
+    db = FakeSession(exists=True)
+
+    assert await cache.user_exists(user_id, db)
+    assert await cache.user_exists(user_id, db)
+    assert db.queries == 1
+
+
+async def test_missing_user_is_not_cached():
+    user_id = uuid.uuid4()
+    db = FakeSession(exists=False)
+
+    assert not await cache.user_exists(user_id, db)
+    assert not await cache.user_exists(user_id, db)
+    assert db.queries == 2
+
+
+async def test_entry_expires_after_ttl(local_cache):
+    user_id = uuid.uuid4()
+    db = FakeSession(exists=True)
+    await cache.mark_user_exists(user_id)
+
+    local_cache.now += cache.USER_EXISTS_TTL - 1
+    assert await cache.user_exists(user_id, db)
+    assert db.queries == 0
+
+    local_cache.now += 2
+    db.exists_result = False
+    assert not await cache.user_exists(user_id, db)
+    assert db.queries == 1
+    assert user_id not in cache._user_exists
+
+
+async def test_oldest_entry_is_evicted_when_full(monkeypatch):
+    monkeypatch.setattr(cache, "USER_EXISTS_MAXSIZE", 2)
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    for user_id in (first, second, third):
+        await cache.mark_user_exists(user_id)
+
+    assert list(cache._user_exists) == [second, third]
+
+
+async def test_forget_user_drops_entry():
+    user_id = uuid.uuid4()
+    db = FakeSession(exists=True)
+    await cache.mark_user_exists(user_id)
+
+    await cache.forget_user(user_id)
+
+    assert await cache.user_exists(user_id, db)
+    assert db.queries == 1
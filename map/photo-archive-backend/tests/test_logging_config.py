@@ -0,0 +1,47 @@
+"""
+Tests for the JSON log formatter
+"""
+import logging
+
+import orjson
+
+from app.logging_config import OrjsonFormatter
+
+
+def make_record(created: float, msg: str = "hello", *args) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, args, None)
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    return record
+
+
+def test_format_time_matches_logging_formatter_across_seconds():
+    formatter = OrjsonFormatter()
+    reference = logging.Formatter()
+
+    # Same second twice, across the boundary, then back to an earlier second
+    for timestamp in (1_700_000_000.001, 1_700_000_000.999, 1_700_000_001.0, 1_700_000_001.5,
+                      1_700_000_000.5):
+        record = make_record(timestamp)
+        assert formatter.formatTime(record) == reference.formatTime(record)
+
+
+def test_format_time_with_datefmt_is_not_cached():
+    formatter = OrjsonFormatter()
+    record = make_record(1_700_000_000.25)
+
+    assert formatter.formatTime(record) == logging.Formatter().formatTime(record)
+    assert formatter.formatTime(record, "%Y") == logging.Formatter().formatTime(record, "%Y")
+
+
+def test_format_produces_json_with_escaped_message():
+    record = make_record(1_700_000_000.25, 'say "%s"\nbye', "hi")
+
+    line = OrjsonFormatter().format(record)
+
+    assert orjson.loads(line) == {
+        "timestamp": logging.Formatter().formatTime(record),
+        "level": "INFO",
+        "logger": "app.test",
+        "message": 'say "hi"\nbye',
+    }
@@ -0,0 +1,101 @@
+"""
+Tests for CORSPreflightMiddleware, stacked in front of CORSMiddleware as in app.main
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+
+from app.middleware import CORSPreflightMiddleware
+
+ALLOWED_ORIGIN = "http://allowed.example"
+METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+
+def make_client(origins, allow_credentials=True) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"ok": True}
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=allow_credentials,
+        allow_methods=METHODS,
+        allow_headers=["*"],
+    )
+    app.add_middleware(
+        CORSPreflightMiddleware,
+        allow_origins=origins,
+        allow_credentials=allow_credentials,
+        allow_methods=METHODS,
+    )
+    return TestClient(app)
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return make_client([ALLOWED_ORIGIN])
+
+
+def preflight(client: TestClient, origin: str, method: str = "POST", **headers):
+    return client.options(
+        "/items",
+        headers={"Origin": origin, "Access-Control-Request-Method": method, **headers},
+    )
+
+
+def test_allowed_preflight_echoes_origin_with_credentials(client):
+    response = preflight(client, ALLOWED_ORIGIN, **{"Access-Control-Request-Headers": "x-trace-id"})
+
+    # CORSMiddleware answers preflights with 200; 204 means ours handled it
+    assert response.status_code == 204
+    assert response.content == b""
+    assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-methods"] == ", ".join(METHODS)
+    assert response.headers["access-control-allow-headers"] == "x-trace-id"
+    assert response.headers["access-control-max-age"] == "600"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_wildcard_origin_without_credentials():
+    response = preflight(make_client(["*"], allow_credentials=False), "http://anywhere.example")
+
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_disallowed_origin_falls_through_to_cors_middleware(client):
+    response = preflight(client, "http://evil.example")
+
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS origin"
+
+
+def test_disallowed_method_falls_through_to_cors_middleware(client):
+    response = preflight(client, ALLOWED_ORIGIN, method="TRACE")
+
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS method"
+
+
+def test_options_without_preflight_headers_is_not_answered(client):
+    response = client.options("/items", headers={"Origin": ALLOWED_ORIGIN})
+
+    # Not a preflight: reaches the app, which has no OPTIONS route
+    assert response.status_code == 405
+
+
+def test_non_options_request_passes_through(client):
+    response = client.get("/items", headers={"Origin": ALLOWED_ORIGIN})
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    # Simple requests are still decorated by CORSMiddleware
+    assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
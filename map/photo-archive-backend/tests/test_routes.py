@@ -0,0 +1,118 @@
+"""
+Tests for the upload and thumbnail helpers in app.api.routes
+"""
+import csv
+import io
+import os
+import uuid
+from tempfile import SpooledTemporaryFile
+
+import pytest
+
+from app.api import routes
+from app.api.routes import accepts_webp, copy_upload_to_storage, encode_copy_rows
+
+SPOOL_MAX_SIZE = 1024
+
+
+def make_spool(data: bytes) -> SpooledTemporaryFile:
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    spool.write(data)
+    return spool
+
+
+def test_copy_in_memory_spool_keeps_contents(tmp_path):
+    data = os.urandom(SPOOL_MAX_SIZE // 2)
+    destination = tmp_path / "photo.jpg"
+
+    file_size, contents = copy_upload_to_storage(make_spool(data), str(destination), 10_000, True)
+
+    assert file_size == len(data)
+    assert contents == data
+    assert destination.read_bytes() == data
+
+
+def test_copy_in_memory_spool_over_max_size(tmp_path):
+    data = os.urandom(SPOOL_MAX_SIZE // 2)
+
+    file_size, _ = copy_upload_to_storage(make_spool(data), str(tmp_path / "photo.jpg"), 100, True)
+
+    assert file_size > 100
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range(2) unavailable")
+def test_copy_rolled_spool_on_disk(tmp_path):
+    data = os.urandom(SPOOL_MAX_SIZE * 5)
+    destination = tmp_path / "video.mp4"
+
+    file_size, contents = copy_upload_to_storage(
+        make_spool(data), str(destination), 10 * SPOOL_MAX_SIZE, False, on_disk=True
+    )
+
+    assert file_size == len(data)
+    assert contents is None
+    assert destination.read_bytes() == data
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range(2) unavailable")
+def test_copy_rolled_spool_over_max_size_writes_nothing(tmp_path):
+    data = os.urandom(SPOOL_MAX_SIZE * 5)
+    destination = tmp_path / "video.mp4"
+
+    file_size, contents = copy_upload_to_storage(
+        make_spool(data), str(destination), SPOOL_MAX_SIZE, False, on_disk=True
+    )
+
+    assert file_size == len(data)
+    assert contents is None
+    assert not destination.exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range(2) unavailable")
+def test_copy_falls_back_when_copy_file_range_copies_nothing(tmp_path, monkeypatch):
+    data = os.urandom(SPOOL_MAX_SIZE * 5)
+    destination = tmp_path / "video.mp4"
+    monkeypatch.setattr(routes.os, "copy_file_range", lambda *args: 0)
+
+    file_size, _ = copy_upload_to_storage(
+        make_spool(data), str(destination), 10 * SPOOL_MAX_SIZE, False, on_disk=True
+    )
+
+    assert file_size == len(data)
+    assert destination.read_bytes() == data
+
+
+def test_encode_copy_rows_round_trips_through_csv():
+    photo_id = uuid.UUID(int=1)
+    rows = [
+        [photo_id, 'holiday, "day 1"\nbeach.jpg', None, 37.5, 1024],
+        [photo_id, "plain.jpg", "/thumbs/plain.webp", -122.25, 0],
+    ]
+
+    encoded = encode_copy_rows(rows)
+
+    assert list(csv.reader(io.StringIO(encoded))) == [
+        [str(photo_id), 'holiday, "day 1"\nbeach.jpg', "", "37.5", "1024"],
+        [str(photo_id), "plain.jpg", "/thumbs/plain.webp", "-122.25", "0"],
+    ]
+
+
+def test_encode_copy_rows_writes_none_as_unquoted_empty_field():
+    # COPY (FORMAT csv) reads an unquoted empty field as NULL
+    assert encode_copy_rows([["a", None, "b"]]) == "a,,b\r\n"
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("*/*", True),
+    ("image/avif,image/webp,*/*;q=0.8", True),
+    ("image/*", True),
+    ("image/jpeg, image/png", False),
+    ("image/webp;q=0, */*", False),
+    ("image/webp; Q=0.0, image/*", False),
+    ("image/jpeg, */*;q=0", False),
+    ("image/*;q=0, */*", False),
+    ("image/*;q=0, image/webp;q=0.5", True),
+    ("", False),
+])
+def test_accepts_webp(accept, expected):
+    assert accepts_webp(accept) is expected